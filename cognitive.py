@@ -1,6 +1,7 @@
+from collections import OrderedDict
 from json import dumps
 from re import sub
-from typing import List
+from typing import List, Tuple
 
 import requests
 from requests import Response
@@ -47,6 +48,9 @@ class EntityResult:
 class NLUService:
     """ Defines a enhanced RASA NLU Service. """
 
+    CACHE_SIZE = 4096
+    """The maximum number of recognition results that will be cached"""
+
     def __init__(self, config: Configuration) -> None:
         """
         Create service by config.
@@ -58,6 +62,9 @@ class NLUService:
 
         self._version = None
 
+        self._cache: OrderedDict[str, Tuple[Tuple[IntentResult, ...], Tuple[EntityResult, ...]]] = OrderedDict()
+        """A LRU cache from sanitized text input to recognition results"""
+
     def recognize(self, content: str) -> (List[IntentResult], List[EntityResult]):
         """
         Interpret input.
@@ -75,6 +82,11 @@ class NLUService:
         if content == "":
             return [], []
 
+        cached = self._cache.get(content)
+        if cached is not None:
+            self._cache.move_to_end(content)
+            return list(cached[0]), list(cached[1])
+
         try:
             payload = dumps({"text": content})
             response = requests.post(f"{self._url}/model/parse", data=payload)
@@ -95,6 +107,10 @@ class NLUService:
         intents = self._to_intents(intent_ranking)
         entities = self._to_entities(content, entities_dump)
 
+        self._cache[content] = (tuple(intents), tuple(entities))
+        if len(self._cache) > NLUService.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
         return intents, entities
 
     @staticmethod
@@ -1,6 +1,9 @@
+import re
+from collections import deque, OrderedDict
+from datetime import datetime, timedelta
+from itertools import islice
 from os import environ
-from threading import Lock
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Callable
 
 from discord import Status, User, Activity, ActivityType, TextChannel, Message
 from discord_components import DiscordComponents, Component, InteractionType, Interaction
@@ -19,45 +22,82 @@ from user_commands.commands import handle_user, init_user_commands, handle_user_
 from utils import get_guild, get_components, MethodVersionStore
 
 
+_MENTION_PATTERN = re.compile(r"<(?:[@#][!&]?|a?:[A-Za-z0-9_-]+:)\d+>")
+"""A pattern that matches raw user, role, and channel mentions as well as custom emojis"""
+
+_WORD_PATTERN = re.compile(r"[^\W_].*?[^\W_]", re.S)
+"""A pattern that matches iff a text contains at least two letters or digits"""
+
+
+def _should_skip_nlu(content: str) -> bool:
+    """
+    Check whether a message can't be interpreted by the NLU (e.g. emojis or punctuation only, or a single character).
+    Mentions (e.g. of the bot itself) and custom emojis will be ignored.
+
+    :param content: the raw content of the message
+    :return: the indicator whether the NLU shall not be invoked for the message
+    """
+    return _WORD_PATTERN.search(_MENTION_PATTERN.sub("", content)) is None
+
+
 class BotInstance:
+    HELP_ID = "Help"
+    """The pseudo dialog id that indicates that the help message shall be sent"""
+
+    DIALOGS: Dict[str, Callable[[BotBase], Dialog]] = {d.ID: d for d in [
+        NotUnderstanding,
+        QnA,
+        Clock,
+        News,
+        Cleanup,
+        QnAAnswer,
+        Choose
+    ]}
+    """A mapping from dialog id to the constructor of the dialog"""
+
+    INTENT_TO_DIALOG: Dict[str, str] = {
+        "None".lower(): NotUnderstanding.ID,
+        "QnA".lower(): QnA.ID,
+        "Clock".lower(): Clock.ID,
+        "News".lower(): News.ID,
+        "Cleanup".lower(): Cleanup.ID,
+        "Answer".lower(): QnAAnswer.ID,
+        "Choose".lower(): Choose.ID,
+        "QnA-Tasks": HELP_ID
+    }
+    """A mapping from intent id to dialog id"""
+
+    INTENT_PREFIX_TO_DIALOG: Tuple[Tuple[str, str], ...] = (
+        ("QnA", QnA.ID),
+    )
+    """A mapping from intent id prefixes to dialog id (used iff no exact mapping exists)"""
+
     def __init__(self, bot):
         self._bot = bot
         """The bot itself"""
 
-        self._dialogs: List[Dialog] = []
-        """A list of all dialogs"""
+        self._dialog_by_id: Dict[str, Dialog] = {}
+        """A mapping from dialog id to the user's dialog (dialogs will be created on first use)"""
 
-        self._intent_to_dialog: Dict[str, str] = {}
-        """A mapping from intent id to dialog id"""
+        self._not_understanding: Dialog = self.__lookup_dialog(NotUnderstanding.ID)
+        """The fallback dialog for inputs that have not been understood"""
 
-        self._load_dialogs()
-
-        self.__active_dialog_stack = []
+        self.__active_dialog_stack: deque = deque()
         """A stack of active (not finished) dialogs."""
 
-    def _load_dialogs(self) -> None:
+    @staticmethod
+    def _resolve_intent(intent: str) -> Optional[str]:
         """
-        Load all dialogs of the bot.
+        Resolve the dialog id of an intent.
+
+        :param intent: the name of the intent
+        :return: the dialog id iff found
         """
-        self._dialogs = [
-            NotUnderstanding(self._bot),
-            QnA(self._bot),
-            Clock(self._bot),
-            News(self._bot),
-            Cleanup(self._bot),
-            QnAAnswer(self._bot),
-            Choose(self._bot)
-        ]
-
-        self._intent_to_dialog = {
-            "None".lower(): NotUnderstanding.ID,
-            "QnA".lower(): QnA.ID,
-            "Clock".lower(): Clock.ID,
-            "News".lower(): News.ID,
-            "Cleanup".lower(): Cleanup.ID,
-            "Answer".lower(): QnAAnswer.ID,
-            "Choose".lower(): Choose.ID
-        }
+        dialog_id = BotInstance.INTENT_TO_DIALOG.get(intent)
+        if dialog_id is not None:
+            return dialog_id
+
+        return next((d for (prefix, d) in BotInstance.INTENT_PREFIX_TO_DIALOG if intent.startswith(prefix)), None)
 
     def __lookup_dialog(self, dialog_id: str) -> Optional[Dialog]:
         """
@@ -66,7 +106,11 @@ class BotInstance:
         :param dialog_id: the dialog id
         :return: the dialog iff found
         """
-        return next((d for d in self._dialogs if d.dialog_id == dialog_id), None)
+        dialog = self._dialog_by_id.get(dialog_id)
+        if dialog is None and dialog_id in BotInstance.DIALOGS:
+            dialog = BotInstance.DIALOGS[dialog_id](self._bot)
+            self._dialog_by_id[dialog_id] = dialog
+        return dialog
 
     async def handle(self, message: Message) -> None:
         """
@@ -74,36 +118,31 @@ class BotInstance:
 
         :param message: the message
         """
-        (intents, entities) = self._bot.nlu.recognize(message.clean_content)
+        if not self.has_active_dialog() and _should_skip_nlu(message.content):
+            (intents, entities) = ([], [])
+        else:
+            (intents, entities) = self._bot.nlu.recognize(message.clean_content)
 
         await self._send_debug(message, intents, entities)
 
-        if len(self.__active_dialog_stack) != 0:
-            dialog = self.__active_dialog_stack.pop(0)
-        elif intents is None or len(intents) == 0:
-            dialog = NotUnderstanding.ID
+        if self.__active_dialog_stack:
+            dialog = self.__lookup_dialog(self.__active_dialog_stack.popleft())
+        elif intents is None or len(intents) == 0 or intents[0].score <= self._bot.config.nlu_threshold:
+            dialog = self._not_understanding
         else:
-            intent = intents[0].name
-            score = intents[0].score
-            dialog = self._intent_to_dialog.get(intent)
-
-            if score <= self._bot.config.nlu_threshold:
-                dialog = NotUnderstanding.ID
-            elif intent == "QnA-Tasks":
-                # Send Help Message for Tasks intent ..
+            dialog_id = self._resolve_intent(intents[0].name)
+            if dialog_id == BotInstance.HELP_ID:
                 await send_help_message(message, self._bot)
                 return
-            elif intent.startswith("QnA"):
-                dialog = QnA.ID
+            dialog = self.__lookup_dialog(dialog_id)
 
-        dialog = self.__lookup_dialog(dialog)
         if dialog is None:
             await send(message.author, message.channel, self._bot, "Dialog nicht gefunden. Bitte an Bot-Admin wenden!")
             return
 
         result = await dialog.proceed(message, intents, entities)
         if result == DialogResult.WAIT_FOR_INPUT:
-            self.__active_dialog_stack.insert(0, dialog.dialog_id)
+            self.__active_dialog_stack.appendleft(dialog.dialog_id)
 
     def has_active_dialog(self) -> bool:
         """
@@ -111,7 +150,7 @@ class BotInstance:
 
         :return: the indicator for an active dialog
         """
-        return len(self.__active_dialog_stack) != 0
+        return bool(self.__active_dialog_stack)
 
     async def _send_debug(self, message: Message, intents: List[IntentResult],
                           entities: List[EntityResult]) -> None:
@@ -125,17 +164,15 @@ class BotInstance:
         if not self._bot.config.is_debug():
             return
 
-        result: str = "------------\n"
-        result += f"Intents({len(intents)}):\n"
-
-        for intent in intents:
-            result += f"{intent}\n"
-
-        result += f"\nEntities({len(entities)}):\n"
-        for entity in entities:
-            result += f"{entity}\n"
-
-        result += "------------"
+        result: str = "\n".join([
+            "------------",
+            f"Intents({len(intents)}):",
+            *map(str, intents),
+            "",
+            f"Entities({len(entities)}):",
+            *map(str, entities),
+            "------------"
+        ])
 
         await send(message.author, message.channel, self._bot, result, mention=False)
 
@@ -143,13 +180,34 @@ class BotInstance:
 class DeltaBot(BotBase):
     """ The DeltaBot main client. """
 
+    UNKNOWN_COMMAND_SYMBOLS = ("!", "/", "\\", "-", "~", "$", "§", "=", "?")
+    """Symbols that are commonly used to start commands for bots"""
+
+    UNKNOWN_COMMAND_NOTIFICATION_TTL = timedelta(days=1)
+    """The time a user will not be notified again about the command symbols"""
+
+    MAX_UNKNOWN_COMMAND_NOTIFICATIONS = 10000
+    """The maximum number of remembered notifications about the command symbols"""
+
+    MAX_INSTANCES = 1024
+    """The maximum number of cached bot instances (users with active dialogs will not be evicted)"""
+
     def __init__(self) -> None:
         """ Initialize the DeltaBot. """
         super().__init__()
         self._methods = MethodVersionStore()
 
-        self._user_to_instance = {}
-        self._user_to_instance_lock = Lock()
+        self._user_to_instance: OrderedDict[int, BotInstance] = OrderedDict()
+        """A LRU cache from user id to the user's bot instance"""
+
+        self._unknown_command_symbols: Tuple[str, ...] = tuple(
+            c for c in DeltaBot.UNKNOWN_COMMAND_SYMBOLS
+            if c not in (self.config.system_command_symbol, self.config.user_command_symbol))
+        """All command symbols that are not used by this bot"""
+
+        self._unknown_command_notifications: OrderedDict[int, datetime] = OrderedDict()
+        """A mapping from user id to the time the user was notified about the command symbols"""
+
         init_user_commands(self)
         self._discord_components = None
 
@@ -169,7 +227,7 @@ class DeltaBot(BotBase):
         self._create_on_socket_response()
 
     def _create_on_socket_response(self):
-        methods = self._methods.get_methods("on_socket_response")
+        methods = tuple(self._methods.get_methods("on_socket_response"))
 
         async def on_socket_response(payload: dict):
             for m in methods:
@@ -240,15 +298,15 @@ class DeltaBot(BotBase):
         selections = payload["data"]["values"]
         user_id = payload["member"]["user"]["id"]
 
-        if user_id == self.user.id:
+        if int(user_id) == self.user.id:
             return
 
-        channel: TextChannel = await self.fetch_channel(cid)
+        channel: TextChannel = self.get_channel(int(cid)) or await self.fetch_channel(cid)
         message: Message = await channel.fetch_message(mid)
         if message.author != self.user:
             return
 
-        user = await self.fetch_user(user_id)
+        user = self.get_user(int(user_id)) or await self.fetch_user(user_id)
         await self._discord_component_response(selection_id, message, user, payload)
 
         if await handle_user_selection(self, payload, message, selection_id, selections, user_id):
@@ -265,16 +323,15 @@ class DeltaBot(BotBase):
         button_id = payload["data"]["custom_id"]
         user_id = payload["member"]["user"]["id"]
 
-        if user_id == self.user.id:
+        if int(user_id) == self.user.id:
             return
 
-        channel: TextChannel = await self.fetch_channel(cid)
+        channel: TextChannel = self.get_channel(int(cid)) or await self.fetch_channel(cid)
         message: Message = await channel.fetch_message(mid)
-
         if message.author != self.user:
             return
 
-        user = await self.fetch_user(user_id)
+        user = self.get_user(int(user_id)) or await self.fetch_user(user_id)
         await self._discord_component_response(button_id, message, user, payload)
 
         if await handle_user_button(self, payload, message, button_id, user_id):
@@ -299,15 +356,15 @@ class DeltaBot(BotBase):
         await interaction.respond(type=InteractionType.DeferredUpdateMessage)
 
     async def _handle_unknown_command_symbols(self, message: Message):
-        command_starts = ["!", "/", "\\", "-", "~", "$", "§", "=", "?"]
-        command_starts.remove(self.config.system_command_symbol)
-        command_starts.remove(self.config.user_command_symbol)
-
-        if not any([message.content.strip().startswith(c) for c in command_starts]):
+        if not message.content.lstrip().startswith(self._unknown_command_symbols):
             return False
 
         user: User = message.author
 
+        notified = self._unknown_command_notifications.get(user.id)
+        if notified is not None and datetime.now() - notified < DeltaBot.UNKNOWN_COMMAND_NOTIFICATION_TTL:
+            return True
+
         text = f"JFYI: Benutzerbefehle starten für mich mit `{self.config.user_command_symbol}`"
 
         # Check whether messages already contain explanations
@@ -315,11 +372,24 @@ class DeltaBot(BotBase):
             if m.author != self.user:
                 continue
             if m.content == text:
+                self.__mark_unknown_command_notification(user)
                 return True
 
         await user.send(text)
+        self.__mark_unknown_command_notification(user)
         return True
 
+    def __mark_unknown_command_notification(self, user: User) -> None:
+        """
+        Remember that a user has been notified about the command symbols.
+
+        :param user: the user
+        """
+        self._unknown_command_notifications[user.id] = datetime.now()
+        self._unknown_command_notifications.move_to_end(user.id)
+        if len(self._unknown_command_notifications) > DeltaBot.MAX_UNKNOWN_COMMAND_NOTIFICATIONS:
+            self._unknown_command_notifications.popitem(last=False)
+
     def __get_bot_instance(self, author: User) -> BotInstance:
         """
         Get the user's bot instance
@@ -327,13 +397,28 @@ class DeltaBot(BotBase):
         :param author: the user
         :return: the bot instance of the user
         """
-        with self._user_to_instance_lock:
-            instance = self._user_to_instance.get(author.id)
-            if instance is None:
-                instance = BotInstance(self)
-                self._user_to_instance[author.id] = instance
+        instance = self._user_to_instance.get(author.id)
+        if instance is not None:
+            self._user_to_instance.move_to_end(author.id)
+            return instance
+
+        self.__evict_bot_instances()
+        instance = BotInstance(self)
+        self._user_to_instance[author.id] = instance
         return instance
 
+    def __evict_bot_instances(self) -> None:
+        """
+        Evict the least recently used bot instances without active dialogs so that a new instance can be added.
+        """
+        overflow = len(self._user_to_instance) - DeltaBot.MAX_INSTANCES + 1
+        if overflow <= 0:
+            return
+
+        evictable = (uid for (uid, instance) in self._user_to_instance.items() if not instance.has_active_dialog())
+        for uid in list(islice(evictable, overflow)):
+            del self._user_to_instance[uid]
+
 
 def start() -> None:
     """The main method of the system."""
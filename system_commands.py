@@ -1,6 +1,6 @@
-from asyncio import iscoroutine
+from asyncio import iscoroutine, gather
 from enum import Enum
-from typing import Union, Callable, Awaitable, List
+from typing import Union, Callable, Awaitable, List, Dict
 
 from discord import Message, TextChannel, User
 
@@ -28,11 +28,19 @@ async def __to_users(bot: BotBase, uids: List[int]) -> List[User]:
     :param uids: the user ids
     :return: the users
     """
-    users = []
-    for uid in uids:
-        user = await bot.fetch_user(uid)
-        users.append(user)
-    return users
+    users = await gather(*(__to_user(bot, uid) for uid in uids))
+    return list(users)
+
+
+async def __to_user(bot: BotBase, uid: int) -> User:
+    """
+    Load a user by id. The user will only be fetched iff not cached.
+
+    :param bot: the bot itself
+    :param uid: the user id
+    :return: the user
+    """
+    return bot.get_user(uid) or await bot.fetch_user(uid)
 
 
 def __not_authorized(bot: BotBase, message: Message) -> Awaitable:
@@ -249,49 +257,54 @@ HandlingFunction = Union[  #
 """The type of a handling function"""
 
 
-async def __handling_template(bot: BotBase, cmd: str, message: Message, handler: HandlingFunction) -> bool:
+async def __handling_template(bot: BotBase, message: Message, handler: HandlingFunction) -> None:
     """
     Template method that handles a command based on a HandlingFunction
 
     :param bot: the bot itself
-    :param cmd: the command to be executed (e.g. "help")
     :param message: the message from the user
-    :param handler: the handling function that shall be executed if the command shall be executed
-    :return: indicator whether the command has been executed
+    :param handler: the handling function that shall be executed
     """
 
-    cmd = f"{bot.config.system_command_symbol}{cmd}"
-    if not message.content.startswith(cmd):
-        return False
-
     if not bot.config.is_admin(message.author):
         run = handler(SystemCommandCallState.NO_ADMIN, bot, message)
         if iscoroutine(run):
             await run
 
         await delete(message, bot)
-        return True
+        return
 
     if is_direct(message):
         run = handler(SystemCommandCallState.DIRECT_MESSAGE, bot, message)
         if iscoroutine(run):
             await run
 
-        return True
+        return
 
     run = handler(SystemCommandCallState.VALID, bot, message)
     if iscoroutine(run):
         await run
 
     await delete(message, bot)
-    return True
 
 
-commands = [__listen, __admin, __echo, __state, __shutdown, __erase, __debug]
+commands: Dict[str, HandlingFunction] = {command.__name__[2:].replace("_", "-"): command for command in
+                                         [__listen, __admin, __echo, __state, __shutdown, __erase, __debug]}
 """
-All Registered System Commands
+All Registered System Commands as name -> handling function
 """
-commands.sort(key=lambda m: len(m.__name__), reverse=True)
+
+
+def __command_name(bot: BotBase, message: Message) -> str:
+    """
+    Extract the name of the invoked system command (e.g. "state" for "\\state").
+
+    :param bot: the bot itself
+    :param message: the message from the user
+    :return: the name of the command or an empty string if none has been given
+    """
+    tokens = message.content[len(bot.config.system_command_symbol):].split(maxsplit=1)
+    return tokens[0] if len(tokens) != 0 else ""
 
 
 async def handle_system(bot: BotBase, message: Message) -> bool:
@@ -306,10 +319,9 @@ async def handle_system(bot: BotBase, message: Message) -> bool:
     if not message.clean_content.strip().startswith(bot.config.system_command_symbol):
         return False
 
-    for command in commands:
-        name = command.__name__[2:].replace("_", "-")
-        if await __handling_template(bot, name, message, command):
-            return True
+    if not message.content.startswith(bot.config.system_command_symbol):
+        return True
 
-    await __handling_template(bot, "", message, __unknown)
+    command = commands.get(__command_name(bot, message), __unknown)
+    await __handling_template(bot, message, command)
     return True
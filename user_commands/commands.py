@@ -1,5 +1,6 @@
+import re
 from asyncio import iscoroutine
-from typing import Union, Callable, Awaitable, List
+from typing import Union, Callable, Awaitable, List, Dict
 
 from discord import Message
 
@@ -17,26 +18,19 @@ HandlingFunction = Union[  #
 ]
 
 
-async def __handling_template(bot: BotBase, cmd: str, message: Message, func: HandlingFunction) -> bool:
+async def __handling_template(bot: BotBase, message: Message, func: HandlingFunction) -> None:
     """
     Template method that handles a command based on a HandlingFunction
 
     :param bot: the bot itself
-    :param cmd: the command to be executed (e.g. "help")
     :param message: the message from the user
-    :param func: the handling function that shall be executed if the command shall be executed
-    :return: indicator whether the command has been executed
+    :param func: the handling function that shall be executed
     """
-    cmd = f"{bot.config.user_command_symbol}{cmd}"
-    if not message.content.startswith(cmd):
-        return False
-
     run = func(message, bot)
     if iscoroutine(run):
         await run
 
     await delete(message, bot)
-    return True
 
 
 async def __unknown(message: Message, bot: BotBase) -> None:
@@ -61,6 +55,13 @@ All Registered Commands
 """
 commands.sort(key=lambda m: len(m.__name__), reverse=True)
 
+__command_by_name: Dict[str, HandlingFunction] = {command.__name__[2:].replace("_", "-"): command for command in
+                                                  commands}
+"""All Registered Commands as name -> handling function"""
+
+__command_pattern: re.Pattern = re.compile("|".join(re.escape(name) for name in __command_by_name.keys()))
+"""A pattern that matches the name of a command (longest names first)"""
+
 
 def init_user_commands(bot: BotBase) -> None:
     """
@@ -83,12 +84,12 @@ async def handle_user(bot: BotBase, message: Message) -> bool:
     if not message.clean_content.strip().startswith(bot.config.user_command_symbol):
         return False
 
-    for command in commands:
-        name = command.__name__[2:].replace("_", "-")
-        if await __handling_template(bot, name, message, command):
-            return True
+    if not message.content.startswith(bot.config.user_command_symbol):
+        return True
 
-    await __handling_template(bot, "", message, __unknown)
+    match = __command_pattern.match(message.content, len(bot.config.user_command_symbol))
+    command = __unknown if match is None else __command_by_name[match.group(0)]
+    await __handling_template(bot, message, command)
     return True
 
 